@@ -3,23 +3,34 @@
 import os
 import json
 import tkinter as tk
+import tkinter.font as tkfont
 from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 import csv
+try:
+	import orjson as _json
+except ImportError:
+	import json as _json
 
 import numpy as np
 import pandas as pd
-import pingouin as pg
 from scipy import stats
-import statsmodels.api as sm
 import matplotlib.pyplot as plt
-from sqlalchemy import create_engine
-from statsmodels.formula.api import ols
 from matplotlib.widgets import RectangleSelector, PolygonSelector, EllipseSelector
 
 from PyTrack.Sensor import Sensor
 from PyTrack.Subject import Subject
 
 
+def _runSubjectAnalysis(sub, average_flag, standardise_flag):
+	"""Runs `subjectAnalysis <#Subject.Subject.subjectAnalysis>`_ for a subject in a worker process and sends the updated subject back.
+
+	"""
+
+	sub.subjectAnalysis(average_flag, standardise_flag)
+	return sub
+
+
 class Visualize:
 
 	def __init__(self, master, subjects, exp):
@@ -32,7 +43,6 @@ class Visualize:
 		self.master_frame = tk.Frame(self.root, height=30, width=70)
 		self.sub_frame = tk.Frame(self.master_frame, height=30, width=70)
 		self.sub_frame.grid_propagate(False)
-		self.text = tk.Text(self.sub_frame, width=50)
 
 		self.submit_frame = tk.Frame(self.root, width=70)
 		func = partial(self.button_click)
@@ -52,50 +62,67 @@ class Visualize:
 		self.sub_frame.destroy()
 		self.submit_frame.pack_forget()
 
-		if self.v.get() == 1:
+		self.sub_frame = tk.Frame(self.master_frame, height=30, width=70)
+		self.sub_frame.grid_propagate(False)
 
-			self.sub_frame = tk.Frame(self.master_frame, height=30, width=70)
-			self.sub_frame.grid_propagate(False)
-			self.text = tk.Text(self.sub_frame, width=50)
+		#Scrollable list of subjects: the widgets are gridded into a frame that lives inside a canvas
+		self.canvas = tk.Canvas(self.sub_frame)
+		sub_list_frame = tk.Frame(self.canvas)
+		self.canvas.create_window((0, 0), window=sub_list_frame, anchor="nw")
+
+		if self.v.get() == 1:
 
 			self.chk_bt_var = [tk.IntVar() for i in range(len(self.subjects))]
 
 			for i, sub in enumerate(self.subjects):
-				func = partial(self.button_click, sub)
-				chk_bt = tk.Checkbutton(self.sub_frame, text=sub.name, variable=self.chk_bt_var[i], onvalue=1, offvalue=0)
-				self.text.window_create(tk.END, window=chk_bt)
-				self.text.insert(tk.END, "\n")
+				chk_bt = tk.Checkbutton(sub_list_frame, text=sub.name, variable=self.chk_bt_var[i], onvalue=1, offvalue=0)
+				chk_bt.grid(row=i, column=0, sticky="w")
 
 			self.submit_frame.pack(side="bottom", fill="both", expand=True)
 
 		else:
 
-			self.sub_frame = tk.Frame(self.master_frame, height=30, width=70)
-			self.sub_frame.grid_propagate(False)
-			self.text = tk.Text(self.sub_frame, width=50)
-
 			for i, sub in enumerate(self.subjects):
 				func = partial(self.button_click, sub)
-				bt = tk.Button(self.sub_frame, width=30, text=sub.name, command=func)
-				self.text.window_create(tk.END, window=bt)
-				self.text.insert(tk.END, "\n")
+				bt = tk.Button(sub_list_frame, width=30, text=sub.name, command=func)
+				bt.grid(row=i, column=0, sticky="w")
+
+		#Layout is computed once, after all the widgets have been gridded
+		sub_list_frame.update_idletasks()
+		#The canvas is as wide as the widest subject and as high as the 24 lines of the default Text widget
+		list_height = 24 * tkfont.nametofont("TkDefaultFont").metrics("linespace")
+		self.canvas.configure(width=sub_list_frame.winfo_reqwidth(), height=list_height, scrollregion=self.canvas.bbox("all"))
+
+		#Unlike a Text widget, a canvas does not scroll with the mouse wheel on its own
+		for widget in [self.canvas, sub_list_frame] + sub_list_frame.winfo_children():
+			widget.bind("<MouseWheel>", self.mouseWheelScroll)
+			widget.bind("<Button-4>", self.mouseWheelScroll)
+			widget.bind("<Button-5>", self.mouseWheelScroll)
 
 		vsb = tk.Scrollbar(self.sub_frame, orient="vertical")
-		vsb.config(command=self.text.yview)
+		vsb.config(command=self.canvas.yview)
 
-		self.text.configure(yscrollcommand=vsb.set)
+		self.canvas.configure(yscrollcommand=vsb.set)
 
-		self.text.pack(side="left", fill="both", expand=True)
+		self.canvas.pack(side="left", fill="both", expand=True)
 		vsb.pack(side="right", fill="y")
 
 		self.sub_frame.pack(side="bottom", fill="both", expand=True)
 
+	def mouseWheelScroll(self, event):
+		# X11 reports the wheel as buttons 4 and 5, Windows and macOS through the delta of <MouseWheel>
+		if event.num == 4 or event.delta > 0:
+			self.canvas.yview_scroll(-1, "units")
+		elif event.num == 5 or event.delta < 0:
+			self.canvas.yview_scroll(1, "units")
+
 	def button_click(self, sub=None):
 		if sub == None:
-			sub_list = []
-			for ind, i in enumerate(self.chk_bt_var):
-				if i.get() == 1:
-					sub_list.append(self.subjects[ind])
+			sub_list = [s for s, v in zip(self.subjects, self.chk_bt_var) if v.get() == 1]
+
+			if len(sub_list) == 0:
+				print("No subject has been selected for group visualization")
+				return
 
 			sub_list[0].subjectVisualize(self.root, viz_type="group", sub_list=sub_list)
 
@@ -127,22 +154,25 @@ class Experiment:
 		json_file = json_file.replace("\\", "/")
 
 		with open(json_file, "r") as json_f:
-			json_data = json.load(json_f)
+			json_data = _json.loads(json_f.read())
 
 		json_data["Path"] = json_data["Path"].replace("\\", "/")
 
+		self._json_data = json_data
 		self.path = json_data["Path"]
 		self.name = json_data["Experiment_name"]
 		self.json_file = json_file #string
 		self.sensors = ["EyeTracker"]
 		self.aoi = aoi
 		self.aoi_coords = None
+		eye_tracker_params = json_data["Analysis_Params"]["EyeTracker"]
+		self._display_wh = (eye_tracker_params["Display_width"], eye_tracker_params["Display_height"])
 		# Setting AOI coordinates
 		if isinstance(aoi, str):
 			if aoi != "NA":
 				self.aoi_coords = self.drawAOI()
 			else:
-				self.aoi_coords = [0.0, 0.0, float(json_data["Analysis_Params"]["EyeTracker"]["Display_width"]), float(json_data["Analysis_Params"]["EyeTracker"]["Display_height"])]
+				self.aoi_coords = [0.0, 0.0, float(self._display_wh[0]), float(self._display_wh[1])]
 		else:
 			self.aoi_coords = aoi
 
@@ -154,7 +184,10 @@ class Experiment:
 		self.columns = self.columnsArrayInitialisation()
 		self.stimuli = self.stimuliArrayInitialisation() #dict of names of stimuli demarcated by category
 		self.subjects = self.subjectArrayInitialisation(reading_method) #list of subject objects
-		self.meta_matrix_dict = (np.ndarray(len(self.subjects), dtype=str), dict())
+		self._stim_index = {name : (cat, i) for cat, names in self.stimuli.items() for i, name in enumerate(names)} #stimulus name -> (category, index)
+		self._subject_index = {sub.name : i for i, sub in enumerate(self.subjects)} #subject name -> index in subjects
+		self.meta_matrix_dict = (None, dict())
+		self._meta_cache = {} #(standardise_flag, average_flag) -> (meta_matrix_dict, aggregate_meta of each subject)
 
 		if not os.path.isdir(self.path + '/Subjects/'):
 			os.makedirs(self.path + '/Subjects/')
@@ -175,8 +208,7 @@ class Experiment:
 
 		"""
 
-		with open(self.json_file) as json_f:
-			json_data = json.load(json_f)
+		json_data = self._json_data
 
 		stimuli_data = json_data["Stimuli"]
 
@@ -215,17 +247,24 @@ class Experiment:
 
 		"""
 
-		with open(self.json_file) as json_f:
-			json_data = json.load(json_f)
+		json_data = self._json_data
 
 		subject_list = []
 
 		subject_data = json_data["Subjects"]
 
 		if reading_method == "SQL":
+			from sqlalchemy import create_engine, text
+			from sqlalchemy.pool import NullPool
+
 			name_of_database = json_data["Experiment_name"]
 			extended_name = "sqlite:///" + self.path + "/Data/" + name_of_database + ".db"
-			database = create_engine(extended_name)
+			#A single connection is shared by all the subjects, so pooling is not needed
+			engine = create_engine(extended_name, poolclass=NullPool)
+			database = engine.connect()
+			#The database is only read from, so memory map it for faster reads
+			database.execute(text("PRAGMA query_only = ON"))
+			database.execute(text("PRAGMA mmap_size = 268435456"))
 
 		elif reading_method == "CSV":
 			database = self.path + "/Data/csv_files/"
@@ -246,7 +285,8 @@ class Experiment:
 				print("The Subject subsection of the json file is not defined properly")
 
 		if reading_method == "SQL":
-			database.dispose()
+			database.close()
+			engine.dispose()
 
 		return subject_list
 
@@ -266,8 +306,7 @@ class Experiment:
 
 		"""
 
-		with open(self.json_file) as json_f:
-			json_data = json.load(json_f)
+		json_data = self._json_data
 
 		column_list = []
 
@@ -294,9 +333,11 @@ class Experiment:
 		root.mainloop()
 
 
-	def metaMatrixInitialisation(self, standardise_flag=False, average_flag=False):
+	def metaMatrixInitialisation(self, standardise_flag=False, average_flag=False, n_jobs=1):
 		"""This function instantiates the ``meta_matrix_dict`` with values that it extracts from the ``aggregate_meta`` variable of each Subject object.
 
+		The ``meta_matrix_dict`` is cached for each combination of flags, so calling this function again with the same flags reuses the earlier result.
+
 		Parameters
 		----------
 		standardise_flag: bool (optional)
@@ -304,24 +345,49 @@ class Experiment:
 		average_flag: bool (optional)
 			Indicates whether the data being considered should averaged across all stimuli of the same type
 			NOTE: Averaging will reduce variability and noise in the data, but will also reduce the quantum of data being fed into the statistical test
+		n_jobs: int (optional)
+			Number of worker processes used to extract the features of the subjects. By default (1) the subjects are analysed one after the other. If -1, one process per CPU core is used. Any other value below 1 is not accepted and the subjects are analysed one after the other.
+			NOTE: With more than 1 job, the script calling this function must be guarded by ``if __name__ == "__main__":`` on Windows and macOS. Every subject is copied to a worker and back, so memory usage increases and the objects in ``subjects`` are replaced by the analysed copies.
 
 		"""
 
+		cache_key = (standardise_flag, average_flag)
+		if cache_key in self._meta_cache:
+			#The aggregate_meta of every subject is restored as well so that it matches the reused meta_matrix_dict
+			self.meta_matrix_dict, aggregate_metas = self._meta_cache[cache_key]
+			for sub, aggregate_meta in zip(self.subjects, aggregate_metas):
+				sub.aggregate_meta = aggregate_meta
+			return
+
+		if n_jobs == -1:
+			n_jobs = os.cpu_count() or 1
+		elif n_jobs < 1:
+			print("The value given to n_jobs is not acceptable, it must be either -1 or at least 1. The subjects will be analysed sequentially")
+			n_jobs = 1
+
+		if n_jobs > 1 and len(self.subjects) > 1:
+			#Feature extraction is independent for every subject, so the subjects can be analysed in parallel
+			with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+				self.subjects = list(executor.map(partial(_runSubjectAnalysis, average_flag=average_flag, standardise_flag=standardise_flag), self.subjects))
+		else:
+			for sub in self.subjects:
+				sub.subjectAnalysis(average_flag, standardise_flag)
+
+		#Instantiation of the meta_matrix_dict database
+		self.meta_matrix_dict = (np.array([sub.subj_type for sub in self.subjects], dtype=object), dict())
+
 		for sensor_type in Sensor.meta_cols:
 			for meta_col in Sensor.meta_cols[sensor_type]:
 				self.meta_matrix_dict[1].update({meta_col : np.ndarray((len(self.subjects), len(self.stimuli)), dtype=object)})
 
-		#Instantiation of the meta_matrix_dict database
 		for sub_index, sub in enumerate(self.subjects):
-			sub.subjectAnalysis(average_flag, standardise_flag)
-
-			self.meta_matrix_dict[0][sub_index] = sub.subj_type
-
 			for stim_index, stimuli_type in enumerate(sub.aggregate_meta):
 
 				for meta in sub.aggregate_meta[stimuli_type]:
 					self.meta_matrix_dict[1][meta][sub_index, stim_index] = sub.aggregate_meta[stimuli_type][meta]
 
+		self._meta_cache[cache_key] = (self.meta_matrix_dict, [sub.aggregate_meta for sub in self.subjects])
+
 
 	def return_index(self, value_index, summation_array):
 		"""This function is used in helping to find the corresponding stimuli for data points in certain parameters, that more than one value for a specific stimuli
@@ -553,8 +619,11 @@ class Experiment:
 
 		"""
 
-		with open(self.json_file, "r") as json_f:
-			json_data = json.load(json_f)
+		import pingouin as pg
+		import statsmodels.api as sm
+		from statsmodels.formula.api import ols
+
+		json_data = self._json_data
 
 		csvFile = None
 		if file_creation:
@@ -571,222 +640,262 @@ class Experiment:
 				writer = csv.writer(csvFile)
 
 
-		meta_not_to_be_considered = ["pupil_size", "pupil_size_downsample"]
+		meta_not_to_be_considered = {"pupil_size", "pupil_size_downsample"}
+		parameter_list = frozenset(parameter_list)
+
+		#The factors only depend on the subject or the stimulus, so they are looked up once instead of once per value
+		#Add the between group factors (need to be defined in the json file)
+		between_rows = []
+		for sub in self.subjects:
+			subject_factors = json_data["Subjects"][sub.subj_type]
+			subject_factors = subject_factors.get(sub.name, {}) if isinstance(subject_factors, dict) else {}
+
+			between_row = []
+			for param in between_factor_list:
+
+				if param == "Subject_type":
+					between_row.append(sub.subj_type)
+				elif param in subject_factors:
+					between_row.append(subject_factors[param])
+				else:
+					print("Between subject paramter: ", param, " not defined in the json file")
+
+			between_rows.append(between_row)
+
+		#Add the within group factors (need to be defined in the json file)
+		within_rows = {}
+		for stimuli_type in self.stimuli:
+			stimuli_factors = json_data["Stimuli"][stimuli_type]
+			if not isinstance(stimuli_factors, dict):
+				stimuli_factors = {}
+
+			within_rows[stimuli_type] = {}
+			for stimulus_name in self.stimuli[stimuli_type]:
+
+				within_row = []
+				for param in within_factor_list:
+
+					if param == "Stimuli_type":
+						within_row.append(stimuli_type)
+					elif param in stimuli_factors.get(stimulus_name, {}):
+						within_row.append(stimuli_factors[stimulus_name][param])
+					else:
+						print("Within stimuli parameter: ", param, " not defined in the json file")
+
+				within_rows[stimuli_type][stimulus_name] = within_row
 
 		sacc_flag=0
 		ms_flag=0
 
-		for sen in self.sensors:
-			for meta in Sensor.meta_cols[sen]:
-				if meta in meta_not_to_be_considered:
-					continue
+		#Metas on which the statistical analysis is carried out, computed once for the whole call
+		metas = [meta for sen in self.sensors for meta in Sensor.meta_cols[sen] if meta not in meta_not_to_be_considered and ('all' in parameter_list or meta in parameter_list)]
 
-				if ('all' not in parameter_list) and (meta not in parameter_list):
-					continue
+		#Parameters that cannot be analysed are reported once instead of being checked for every meta
+		ignored_parameters = parameter_list - {"all"} - set(metas)
+		if len(ignored_parameters) != 0:
+			print("The following parameters cannot be analysed and will be ignored: ", sorted(ignored_parameters))
 
-				print("\n\n")
-				print("\t\t\t\tAnalysis for ",meta)
+		#Saccade and microsaccade metas have one value per event, so their stimulus is found through the summation array
+		event_metas = {"sacc_duration", "sacc_vel", "sacc_amplitude", "ms_duration", "ms_vel", "ms_amplitude"}
 
-				#For the purpose of statistical analysis, a pandas dataframe needs to be created that can be fed into the statistical functions
-				#The columns required are - meta (indicator), the between factors (eg: Subject type or Gender), the within group factor (eg: Stimuli Type), Subject name/id
+		#For the purpose of statistical analysis, a pandas dataframe needs to be created that can be fed into the statistical functions
+		#A single long-form dataframe is built for all the metas in one pass over the subjects and stimuli
+		#The columns required are - parameter, value of the indicator, the between factors (eg: Subject type or Gender), the within group factor (eg: Stimuli Type), Subject name/id
 
-				#Defining the list of columns required for the statistical analysis
-				column_list = [meta]
+		#Defining the list of columns required for the statistical analysis
+		column_list = ["parameter", "value"]
 
-				column_list.extend(between_factor_list)
-				column_list.extend(within_factor_list)
-				column_list.append("subject")
-				column_list.append("stimuli_name")
+		column_list.extend(between_factor_list)
+		column_list.extend(within_factor_list)
+		column_list.append("subject")
+		column_list.append("stimuli_name")
 
-				data =  pd.DataFrame(columns=column_list)
+		rows = []
 
-				#For each subject
-				for sub_index, sub in enumerate(self.subjects):
-					#For each Question Type
-					for stimuli_index, stimuli_type in enumerate(sub.aggregate_meta):
+		#For each subject
+		for sub_index, sub in enumerate(self.subjects):
+			sub_prefix = between_rows[sub_index]
 
-						if meta in ["sacc_duration", "sacc_vel", "sacc_amplitude", "ms_duration", "ms_vel", "ms_amplitude"]:
-							summation_array = self.summationArrayCalculation(meta, sub_index, stimuli_index)
-						
-						value_array = self.meta_matrix_dict[1][meta][sub_index,stimuli_index]
+			#For each Question Type
+			for stimuli_index, stimuli_type in enumerate(sub.aggregate_meta):
+				stimuli_names = self.stimuli[stimuli_type]
+				sub_within_rows = within_rows[stimuli_type]
 
-						index_extra = 0
+				for meta in metas:
 
-						for value_index, _ in enumerate(value_array):
+					if meta in event_metas:
+						summation_array = self.summationArrayCalculation(meta, sub_index, stimuli_index)
 
-							if meta in ["sacc_duration", "sacc_vel", "sacc_amplitude", "ms_duration", "ms_vel", "ms_amplitude"]:
+					value_array = self.meta_matrix_dict[1][meta][sub_index,stimuli_index]
+					if value_array is None:
+						continue
 
-								if value_array[value_index] == 0:
-									index_extra += 1
-									continue
+					value_array = np.atleast_1d(value_array)
+					if value_array.size == 0:
+						continue
 
-								proper_index = self.return_index(value_index-index_extra, summation_array)
-								stimulus_name = self.stimuli[stimuli_type][proper_index]
-							else:
-								stimulus_name = self.stimuli[stimuli_type][value_index]
+					has_nan = np.isnan(value_array).any()
 
-							row = []
-							row.append(value_array[value_index])
+					index_extra = 0
 
-							#Add the between group factors (need to be defined in the json file)
-							for param in between_factor_list:
+					for value_index, _ in enumerate(value_array):
 
-								if param == "Subject_type":
-									row.append(sub.subj_type)
-									continue
+						if meta in event_metas:
 
-								try:
-									row.append(json_data["Subjects"][sub.subj_type][sub.name][param])
-								except:
-									print("Between subject paramter: ", param, " not defined in the json file")
+							if value_array[value_index] == 0:
+								index_extra += 1
+								continue
 
-							for param in within_factor_list:
+							proper_index = self.return_index(value_index-index_extra, summation_array)
+							stimulus_name = stimuli_names[proper_index]
+						else:
+							stimulus_name = stimuli_names[value_index]
 
-								if param == "Stimuli_type":
-									row.append(stimuli_type)
-									continue
+						row = [meta, value_array[value_index]] + sub_prefix + sub_within_rows[stimulus_name] + [sub.name, stimulus_name]
 
-								try:
-									stimulus_name = self.stimuli[stimuli_type][value_index]
-									row.append(json_data["Stimuli"][stimuli_type][stimulus_name][param])
-								except:
-									print("Within stimuli parameter: ", param, " not defined in the json file")
+						if has_nan and np.isnan(value_array[value_index]):
+							print("The data being read for analysis contains null value: ", row)
 
-							row.append(sub.name)
-							row.append(stimulus_name)
+						rows.append(row)
 
-							if np.isnan(value_array[value_index]):
-								print("The data being read for analysis contains null value: ", row)
+		#Instantiate the pandas dataframe in one go and split it by parameter
+		long_data = pd.DataFrame(rows, columns=column_list)
+		meta_data = {meta : data for meta, data in long_data.groupby("parameter", sort=False)}
 
-							#Instantiate into the pandas dataframe
-							data.loc[len(data)] = row
+		for meta in metas:
 
-				data.to_csv(directory_path + '/Data/' + meta + "_data.csv")
+			print("\n\n")
+			print("\t\t\t\tAnalysis for ",meta)
 
-				#print(data)
+			data = meta_data.get(meta, long_data.iloc[0:0])
+			data = data.drop(columns="parameter").rename(columns={"value" : meta}).reset_index(drop=True)
 
-				#Depending on the parameter, choose the statistical test to be done
-				if statistical_test == "Mixed_anova":
+			data.to_csv(directory_path + '/Data/' + meta + "_data.csv")
 
-					if len(within_factor_list)>1:
-						print("Error: Too many within group factors,\nMixed ANOVA can only accept 1 within group factor\n")
-					elif len(between_factor_list)>1:
-						print("Error: Too many between group factors,\nMixed ANOVA can only accept 1 between group factor\n")
+			#print(data)
 
-					print(meta, ":\tMixed ANOVA")
-					aov = pg.mixed_anova(dv=meta, within=within_factor_list[0], between=between_factor_list[0], subject='subject', data=data)
-					pg.print_table(aov)
+			#Depending on the parameter, choose the statistical test to be done
+			if statistical_test == "Mixed_anova":
 
-					if file_creation:
+				if len(within_factor_list)>1:
+					print("Error: Too many within group factors,\nMixed ANOVA can only accept 1 within group factor\n")
+				elif len(between_factor_list)>1:
+					print("Error: Too many between group factors,\nMixed ANOVA can only accept 1 between group factor\n")
 
-						values_list = ["Mixed Anova: "]
-						values_list.append(meta)
-						self.fileWriting(writer, csvFile, aov, values_list)
+				print(meta, ":\tMixed ANOVA")
+				aov = pg.mixed_anova(dv=meta, within=within_factor_list[0], between=between_factor_list[0], subject='subject', data=data)
+				pg.print_table(aov)
 
-					posthocs = pg.pairwise_ttests(dv=meta, within=within_factor_list[0], between=between_factor_list[0], subject='subject', data=data)
-					pg.print_table(posthocs)
+				if file_creation:
 
-					if file_creation:
+					values_list = ["Mixed Anova: "]
+					values_list.append(meta)
+					self.fileWriting(writer, csvFile, aov, values_list)
 
-						values_list = ["Post Hoc Analysis"]
-						self.fileWriting(writer, csvFile, posthocs, values_list)
+				posthocs = pg.pairwise_ttests(dv=meta, within=within_factor_list[0], between=between_factor_list[0], subject='subject', data=data)
+				pg.print_table(posthocs)
 
-				elif statistical_test == "RM_anova":
+				if file_creation:
 
-					if len(within_factor_list)>2 or len(within_factor_list)<1:
-						print("Error: Too many or too few within group factors,\nRepeated Measures ANOVA can only accept 1 or 2 within group factors\n")
+					values_list = ["Post Hoc Analysis"]
+					self.fileWriting(writer, csvFile, posthocs, values_list)
 
-					print(meta, ":\tRM ANOVA")
-					aov = pg.rm_anova(dv=meta, within= within_factor_list, subject = 'subject', data=data)
-					pg.print_table(aov)
+			elif statistical_test == "RM_anova":
 
-					if file_creation:
+				if len(within_factor_list)>2 or len(within_factor_list)<1:
+					print("Error: Too many or too few within group factors,\nRepeated Measures ANOVA can only accept 1 or 2 within group factors\n")
 
-						values_list = ["Repeated Measures Anova: "]
-						values_list.append(meta)
-						self.fileWriting(writer, csvFile, aov, values_list)
+				print(meta, ":\tRM ANOVA")
+				aov = pg.rm_anova(dv=meta, within= within_factor_list, subject = 'subject', data=data)
+				pg.print_table(aov)
 
-				elif statistical_test == "anova":
+				if file_creation:
 
-					print(meta, ":\tANOVA")
-					length = len(between_factor_list)
-					model_equation = meta + " ~ C("
+					values_list = ["Repeated Measures Anova: "]
+					values_list.append(meta)
+					self.fileWriting(writer, csvFile, aov, values_list)
 
-					for factor_index, _ in enumerate(between_factor_list):
-						if(factor_index<length-1):
-							model_equation = model_equation + between_factor_list[factor_index] + ")*C("
-						else:
-							model_equation = model_equation + between_factor_list[factor_index] + ")"
-
-					print("Including interaction effect")
-					print(model_equation)
-					model = ols(model_equation, data).fit()
-					res = sm.stats.anova_lm(model, typ= 2)
-					print(res)
-
-					if file_creation:
-
-						values_list = ["Anova including interaction effect: "]
-						values_list.append(meta)
-						self.fileWriting(writer, csvFile, res, values_list)
-
-					print("\nExcluding interaction effect")
-					model_equation = model_equation.replace("*", "+")
-					print(model_equation)
-					model = ols(model_equation, data).fit()
-					res = sm.stats.anova_lm(model, typ= 2)
-					print(res)
-
-					if file_creation:
-
-						values_list = ["Anova excluding interaction effect: "]
-						values_list.append(meta)
-						self.fileWriting(writer, csvFile, res, values_list)
-
-				elif statistical_test == "ttest":
-
-					print(meta, ":\tt test")
-
-					if ttest_type==1:
-						aov = pg.pairwise_ttests(dv=meta, between=between_factor_list, subject='subject', data=data)
-						pg.print_table(aov)
-					elif ttest_type==2:
-						aov = pg.pairwise_ttests(dv=meta, within=within_factor_list, subject='subject', data=data)
-						pg.print_table(aov)
-					elif ttest_type==3:
-						aov = pg.pairwise_ttests(dv=meta, between=between_factor_list, within=within_factor_list, subject='subject', data=data)
-						pg.print_table(aov)
+			elif statistical_test == "anova":
+
+				print(meta, ":\tANOVA")
+				length = len(between_factor_list)
+				model_equation = meta + " ~ C("
+
+				for factor_index, _ in enumerate(between_factor_list):
+					if(factor_index<length-1):
+						model_equation = model_equation + between_factor_list[factor_index] + ")*C("
 					else:
-						print("The value given to ttest_type is not acceptable, it must be either 1 or 2 or 3")
+						model_equation = model_equation + between_factor_list[factor_index] + ")"
 
+				print("Including interaction effect")
+				print(model_equation)
+				model = ols(model_equation, data).fit()
+				res = sm.stats.anova_lm(model, typ= 2)
+				print(res)
 
-					if file_creation:
+				if file_creation:
 
-						values_list = ["Pairwise ttest: "]
-						values_list.append(meta)
-						self.fileWriting(writer, csvFile, aov, values_list)
+					values_list = ["Anova including interaction effect: "]
+					values_list.append(meta)
+					self.fileWriting(writer, csvFile, res, values_list)
 
-				elif statistical_test == "welch_ttest":
+				print("\nExcluding interaction effect")
+				model_equation = model_equation.replace("*", "+")
+				print(model_equation)
+				model = ols(model_equation, data).fit()
+				res = sm.stats.anova_lm(model, typ= 2)
+				print(res)
 
-					print(meta, ":\tWelch t test")
+				if file_creation:
 
-					if ttest_type==1:
-						normality,aov = self.welch_ttest(dv=meta, factor=between_factor_list[0], subject='subject', data=data)
-						pg.print_table(normality)
-						pg.print_table(aov)
-					elif ttest_type==2:
-						normality,aov = self.welch_ttest(dv=meta, factor=within_factor_list[0], subject='subject', data=data)
-						pg.print_table(normality)
-						pg.print_table(aov)
-					else:
-						print("The value given to ttest_type for welch test is not acceptable, it must be either 1 or 2")
+					values_list = ["Anova excluding interaction effect: "]
+					values_list.append(meta)
+					self.fileWriting(writer, csvFile, res, values_list)
+
+			elif statistical_test == "ttest":
+
+				print(meta, ":\tt test")
+
+				if ttest_type==1:
+					aov = pg.pairwise_ttests(dv=meta, between=between_factor_list, subject='subject', data=data)
+					pg.print_table(aov)
+				elif ttest_type==2:
+					aov = pg.pairwise_ttests(dv=meta, within=within_factor_list, subject='subject', data=data)
+					pg.print_table(aov)
+				elif ttest_type==3:
+					aov = pg.pairwise_ttests(dv=meta, between=between_factor_list, within=within_factor_list, subject='subject', data=data)
+					pg.print_table(aov)
+				else:
+					print("The value given to ttest_type is not acceptable, it must be either 1 or 2 or 3")
 
-					if file_creation:
 
-						values_list = ["Welch Pairwise ttest: "]
-						values_list.append(meta)
-						self.fileWriting(writer, csvFile, normality, values_list)
-						self.fileWriting(writer, csvFile, aov, values_list)
+				if file_creation:
+
+					values_list = ["Pairwise ttest: "]
+					values_list.append(meta)
+					self.fileWriting(writer, csvFile, aov, values_list)
+
+			elif statistical_test == "welch_ttest":
+
+				print(meta, ":\tWelch t test")
+
+				if ttest_type==1:
+					normality,aov = self.welch_ttest(dv=meta, factor=between_factor_list[0], subject='subject', data=data)
+					pg.print_table(normality)
+					pg.print_table(aov)
+				elif ttest_type==2:
+					normality,aov = self.welch_ttest(dv=meta, factor=within_factor_list[0], subject='subject', data=data)
+					pg.print_table(normality)
+					pg.print_table(aov)
+				else:
+					print("The value given to ttest_type for welch test is not acceptable, it must be either 1 or 2")
+
+				if file_creation:
+
+					values_list = ["Welch Pairwise ttest: "]
+					values_list.append(meta)
+					self.fileWriting(writer, csvFile, normality, values_list)
+					self.fileWriting(writer, csvFile, aov, values_list)
 
 
 		if csvFile != None:
@@ -819,28 +928,13 @@ class Experiment:
 		To get the names of all the metadata/features extracted, look at the `Sensor <#module-Sensor>`_ class
 
 		"""
+		sub_ind = self._subject_index[sub]
+
 		if stim == None:
-			sub_ind = -1
-			for ind, subject in enumerate(self.subjects):
-				if subject.name == sub:
-					sub_ind = ind
-					break
 			return self.subjects[sub_ind].aggregate_meta
 
 		else:
-			sub_ind = -1
-			for ind, subject in enumerate(self.subjects):
-				if subject.name == sub:
-					sub_ind = ind
-					break
-
-			stim_cat = ""
-			stim_ind = -1
-			for cat in self.stimuli:
-				if stim in self.stimuli[cat]:
-					stim_ind = self.stimuli[cat].index(stim)
-					stim_cat = cat
-					break
+			stim_cat, stim_ind = self._stim_index[stim]
 
 			return self.subjects[sub_ind].stimulus[stim_cat][stim_ind].sensors[sensor].metadata
 
@@ -850,29 +944,25 @@ class Experiment:
 
 		"""
 
-		with open(self.json_file, "r") as f:
-			json_data = json.load(f)
-
 		aoi_left_x = 0
 		aoi_left_y = 0
 		aoi_right_x = 0
 		aoi_right_y = 0
 
-		display_width = json_data["Analysis_Params"]["EyeTracker"]["Display_width"]
-		display_height = json_data["Analysis_Params"]["EyeTracker"]["Display_height"]
+		display_width, display_height = self._display_wh
 
-		cnt = 0
 		img = None
 
+		#Only the first stimulus image is needed, so stop scanning the directory once it is found
 		if os.path.isdir(self.path + "/Stimuli/"):
-			for f in os.listdir(self.path + "/Stimuli/"):
-				if f.split(".")[-1] in ['jpg', 'jpeg', 'png']:
-					img = plt.imread(self.path + "/Stimuli/" + f)
-					cnt += 1
-					break
-
-		if cnt == 0:
-			img = np.zeros((display_height, display_width, 3))
+			with os.scandir(self.path + "/Stimuli/") as entries:
+				for entry in entries:
+					if entry.is_file() and entry.name.lower().endswith(('.jpg', '.jpeg', '.png')):
+						img = plt.imread(entry.path)
+						break
+
+		if img is None:
+			img = np.zeros((display_height, display_width, 3), dtype=np.uint8)
 
 		fig, ax = plt.subplots()
 		fig.canvas.set_window_title("Draw AOI")
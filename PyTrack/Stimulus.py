@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
 import os
-import json
 from datetime import datetime
+try:
+	import orjson as _json
+except ImportError:
+	import json as _json
 
 import numpy as np
 import pandas as pd
@@ -80,7 +83,7 @@ class Stimulus:
 		if self.json_file != None:
 			self.aoi_coords = aoi
 			with open(self.json_file) as json_f:
-				json_data = json.load(json_f)
+				json_data = _json.loads(json_f.read())
 
 			self.width = json_data["Analysis_Params"]["EyeTracker"]["Display_width"]
 			self.height = json_data["Analysis_Params"]["EyeTracker"]["Display_height"]
@@ -1627,7 +1630,7 @@ class Stimulus:
 		# Extracting data for particular stimulus
 
 		with open(self.json_file) as jf:
-			contents = json.load(jf)
+			contents = _json.loads(jf.read())
 
 		extracted_data = {	"ETRows" : None,
 							"FixationSeq" : None,
@@ -1869,7 +1872,7 @@ def groupHeatMap(sub_list, stim_name, json_file, save_fig=False):
 	y = np.repeat(y, 5)
 
 	with open(json_file) as json_f:
-		json_data = json.load(json_f)
+		json_data = _json.loads(json_f.read())
 		path = json_data["Path"]
 		path = path.replace("\\", "/")
 		width = json_data["Analysis_Params"]["EyeTracker"]["Display_width"]
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 
 import os
-import json
 import pickle
 import tkinter as tk
 from datetime import datetime
 from functools import partial
+try:
+	import orjson as _json
+except ImportError:
+	import json as _json
 
 import pandas as pd
 import numpy as np
@@ -121,8 +124,8 @@ class Subject:
 		Name of json file that contains information regarding the experiment/database
 	sensors: list(str)
 		Contains the names of the different sensors whose indicators are being analysed
-	database: str | SQL object
-		is the SQL object for the SQL database | name of the folder that contains the name csv files
+	database: str | SQL connection
+		is the connection to the SQL database | name of the folder that contains the name csv files
 	manual_eeg: bool
 		Indicates whether artifact removal is manually done or not
 	reading_method: str
@@ -142,6 +145,7 @@ class Subject:
 		self.stimulus = self.stimulusDictInitialisation(stimuli_names, columns, json_file, sensors, database, reading_method)
 		self.control_data = self.getControlData()
 		self.aggregate_meta = {}
+		self._agg_cache = {} #(standardise_flag, average_flag) -> aggregate_meta
 		b = datetime.now()
 		print("Total time to instantiate subject ", self.name, ": ", (b-a).seconds, "s\n")
 
@@ -155,8 +159,8 @@ class Subject:
 			list of the names of the columns of interest
 		json_file: str
 			Name of the json file that contains information about the experiment
-		database: SQL object| str
-			is the SQL object for the SQL database | name of the folder that contains the name csv files
+		database: SQL connection | str
+			is the connection to the SQL database | name of the folder that contains the name csv files
 		reading_method: str {"SQL","CSV"}
 			Describes which type of databse is to be used for data extraction
 		stimuli_names: list(str)
@@ -170,39 +174,17 @@ class Subject:
 		"""
 
 		if reading_method == "SQL":
+			from sqlalchemy import text, bindparam
 
-			string = 'SELECT '
-			index = 0
 			a = datetime.now()
 
-			for name in columns:
-
-				if index == 0:
-					string = string + name
-					index = index + 1
-				else:
-					string = string + ',' + name
-					index = index + 1
+			selected_stimuli = [name for k in stimuli_names for name in stimuli_names[k]]
 
 			#NTBD: Change StimulusName from being Hardcoded
-			query = string + ' FROM "' + self.name + '" WHERE StimulusName in ('
-			flag = -1
-
-			for k in stimuli_names:
-				for name in stimuli_names[k]:
-
-					if flag == -1:
-						flag = 0
-						selected_stimuli = "'" + name + "'"
-					else:
-						selected_stimuli = selected_stimuli + ", '" + name + "'"
+			query = text('SELECT ' + ','.join(columns) + ' FROM "' + self.name + '" WHERE StimulusName IN :stimuli')
+			query = query.bindparams(bindparam("stimuli", expanding=True))
 
-			query = query + selected_stimuli + ")"
-
-			dummy = database.execute(query)
-
-			conversion = pd.DataFrame(dummy.fetchall())
-			conversion.columns = dummy.keys()
+			conversion = pd.read_sql_query(query, database, params={"stimuli": selected_stimuli})
 
 			return conversion
 
@@ -280,8 +262,8 @@ class Subject:
 			Name of json file that contains information about the experiment/database
 		sensors: object of class Sensor
 			Is an object of class sensor and is used to see if EEG extraction is required
-		database: SQL object | str
-			Is the SQL object that is created for accessing the SQL database | Name of the folder containing the CSV files
+		database: SQL connection | str
+			Is the connection that is opened for accessing the SQL database | Name of the folder containing the CSV files
 		reading_method: str {"SQL","CSV"}
 			Describes which type of databse is to be used for data extraction
 
@@ -346,7 +328,7 @@ class Subject:
 				control[sen].update({meta: 0})
 
 		with open(self.json_file) as json_f:
-			json_data = json.load(json_f)
+			json_data = _json.loads(json_f.read())
 
 		if "Control_Questions" in json_data:
 			if not os.path.isdir(self.path + '/control_values/'):
@@ -393,7 +375,7 @@ class Subject:
 	def subjectAnalysis(self, average_flag, standardise_flag):
 		"""Function to find features for all stimuli for a given subject.
 
-		Does not return any value. It stores the calculated features/metadata in its `aggregate_meta` member variable. Can be accessed by an object of the class. For structure of this variable see `Subject <#module-Subject>`_.
+		Does not return any value. It stores the calculated features/metadata in its `aggregate_meta` member variable. Can be accessed by an object of the class. For structure of this variable see `Subject <#module-Subject>`_. The result is cached per combination of flags, so repeated calls with the same flags do not recompute the features.
 
 		Parameters
 		----------
@@ -404,6 +386,12 @@ class Subject:
 
 		"""
 
+		cache_key = (standardise_flag, average_flag)
+		if cache_key in self._agg_cache:
+			self.aggregate_meta = self._agg_cache[cache_key]
+			return
+
+		self.aggregate_meta = {}
 		for st in self.stimulus:
 			self.aggregate_meta.update({st : {}})
 			for sen in self.sensors:
@@ -426,4 +414,6 @@ class Subject:
 			for s in self.stimulus:
 				for sen in self.sensors:
 					for cd in Sensor.meta_cols[sen]:
-						self.aggregate_meta[s][cd] = np.array([np.mean(self.aggregate_meta[s][cd], axis=0)])
\ No newline at end of file
+						self.aggregate_meta[s][cd] = np.array([np.mean(self.aggregate_meta[s][cd], axis=0)])
+
+		self._agg_cache[cache_key] = self.aggregate_meta
@@ -41,6 +41,27 @@ class TestMethods(unittest.TestCase):
         finally:
             self.assertEqual(check, 1)
 
+        self.assertEqual(list(exp.meta_matrix_dict[0]), [s.subj_type for s in exp.subjects])
+
+        # Repeated calls reuse the cached features of the same flags
+        first_meta_matrix_dict = exp.meta_matrix_dict
+        first_aggregate_metas = [s.aggregate_meta for s in exp.subjects]
+
+        exp.metaMatrixInitialisation(standardise_flag=False,
+                                average_flag=False)
+        self.assertIs(exp.meta_matrix_dict, first_meta_matrix_dict)
+
+        exp.metaMatrixInitialisation(standardise_flag=False,
+                                average_flag=True)
+        self.assertIsNot(exp.meta_matrix_dict, first_meta_matrix_dict)
+
+        exp.metaMatrixInitialisation(standardise_flag=False,
+                                average_flag=False)
+        self.assertIs(exp.meta_matrix_dict, first_meta_matrix_dict)
+        self.assertIs(exp.meta_matrix_dict[1], first_meta_matrix_dict[1])
+        for sub, aggregate_meta in zip(exp.subjects, first_aggregate_metas):
+            self.assertIs(sub.aggregate_meta, aggregate_meta)
+
         check = 0
         try:
             exp.analyse(parameter_list={"all"},